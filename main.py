@@ -1,10 +1,15 @@
 import os
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from routers import recommend, builds
+from routers import recommend, builds, meta, predict
 from services.scheduler import start_scheduler
+from services import metrics
+from services.model_router import router as model_router
+from services.traffic_capture import CAPTURE_RATE, TrafficCaptureMiddleware
+from services.admission import AdmissionRejected
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -41,6 +46,15 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -52,9 +66,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Захват реального трафика для replay (включается через TRAFFIC_CAPTURE_RATE > 0)
+if CAPTURE_RATE > 0:
+    app.add_middleware(TrafficCaptureMiddleware, sample_rate=CAPTURE_RATE)
+    logging.info(f"🎙️ Захват трафика включён: доля запросов {CAPTURE_RATE}")
+
 # === Роутеры ===
 app.include_router(recommend.router)
 app.include_router(builds.router)
+app.include_router(meta.router)
+app.include_router(predict.router)
 
 # === Планировщик задач ===
 @app.on_event("startup")
@@ -70,3 +91,8 @@ async def root():
         "message": "Dota 2 AI API is running.",
         "version": "1.0.0"
     }
+
+# === Метрики ===
+@app.get("/metrics", tags=["health"])
+async def get_metrics():
+    return {**metrics.snapshot(), "models": model_router.report()}
@@ -14,11 +14,16 @@ class DraftInput(BaseModel):
     user_role: Literal["mid", "safelane", "offlane", "support", "hard support"]
     user_hero: Optional[str] = None
     aspect: Optional[str] = None
+    banned_heroes: List[str] = Field(default_factory=list)
 
     @validator("enemy_heroes", "ally_heroes", pre=True)
     def remove_duplicates(cls, v):
         return list(dict.fromkeys(v or []))[:5]
 
+    @validator("banned_heroes", pre=True)
+    def remove_duplicate_bans(cls, v):
+        return list(dict.fromkeys(v or []))[:24]
+
     class Config:
         schema_extra = {
             "example": {
@@ -104,3 +109,38 @@ class DetailedBuildResponse(BaseModel):
     builds: List[BuildPlan] = Field(default_factory=list)
     warnings: List[str]
     source: SOURCE_ENUM
+
+# ===== Draft Prediction (/predict) =====
+
+class DraftPredictionInput(BaseModel):
+    ally_heroes: List[str] = Field(default_factory=list, max_length=5)
+    enemy_heroes: List[str] = Field(default_factory=list, max_length=5)
+
+class DraftPrediction(BaseModel):
+    win_probability: float
+    confidence_interval: List[float]
+    logit: float
+    breakdown: Dict[str, float] = Field(default_factory=dict)
+    generation: int
+
+class BatchPredictionInput(BaseModel):
+    drafts: List[DraftPredictionInput] = Field(..., min_length=1, max_length=10000)
+
+class BatchPredictionResponse(BaseModel):
+    win_probabilities: List[float]
+    confidence_intervals: List[List[float]]
+    generation: int
+
+# ===== Ban Recommendation (/predict/bans) =====
+
+class BanSuggestion(BaseModel):
+    hero: str
+    threat: float
+    win_probability_if_picked: float
+    best_response: Optional[str] = None
+    breakdown: Dict[str, float] = Field(default_factory=dict)
+
+class BanRecommendationResponse(BaseModel):
+    current_win_probability: float
+    bans: List[BanSuggestion]
+    generation: int
@@ -1,7 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Literal
-from services.openai_generator import generate_build_options, generate_detailed_build
+from services.openai_generator import (
+    generate_build_options,
+    generate_detailed_build,
+    is_detailed_build_cached,
+)
+from services.admission import AdmissionRejected, run_admitted
+from services.logic import fallback_build_options, fallback_detailed_build
 
 router = APIRouter(
     prefix="/builds",
@@ -53,13 +59,17 @@ async def get_build_options(request: BuildOptionsRequest):
     Генерирует список билдов (коротких вариантов) после выбора героя и аспекта.
     """
     try:
-        builds = generate_build_options(
+        builds = await run_admitted(
+            generate_build_options,
             hero=request.user_hero,
             role=request.user_role,
             aspect=request.aspect,
-            enemy_lane_heroes=request.enemy_lane_heroes
+            enemy_lane_heroes=request.enemy_lane_heroes,
+            degrade=lambda: fallback_build_options(request),
         )
-        return BuildOptionsResponse(builds=[BuildVariant(**b) for b in builds])
+        return BuildOptionsResponse(builds=[BuildVariant(**dict(b)) for b in builds])
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка генерации билдов: {e}")
 
@@ -68,15 +78,32 @@ async def get_detailed_build(request: DetailedBuildRequest):
     """
     Генерирует подробный билд на основе выбранного BuildVariant и текущего драфта.
     """
+    params = dict(
+        hero=request.user_hero,
+        role=request.user_role,
+        aspect=request.aspect,
+        selected_build_id=request.selected_build_id,
+        enemy_heroes=request.enemy_heroes,
+        ally_heroes=request.ally_heroes,
+    )
     try:
-        build = generate_detailed_build(
-            hero=request.user_hero,
-            role=request.user_role,
-            aspect=request.aspect,
-            selected_build_id=request.selected_build_id,
-            enemy_heroes=request.enemy_heroes,
-            ally_heroes=request.ally_heroes,
+        # Ответ целиком из кэша не занимает место в очереди к OpenAI
+        if is_detailed_build_cached(**params):
+            return generate_detailed_build(**params)
+
+        return await run_admitted(
+            generate_detailed_build,
+            **params,
+            degrade=lambda: fallback_detailed_build(
+                hero=request.user_hero,
+                role=request.user_role,
+                aspect=request.aspect,
+                enemy_lane_heroes=request.enemy_heroes,
+                team_heroes=request.ally_heroes,
+                selected_build_id=request.selected_build_id,
+            ),
         )
-        return build
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка генерации подробного билда: {e}")
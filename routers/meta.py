@@ -0,0 +1,169 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
+
+from services.meta_history import METRICS, trending_heroes
+from services.meta_store import (
+    choose_encoding,
+    get_snapshot,
+    parse_fields,
+    render,
+)
+
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+router = APIRouter(
+    prefix="/meta",
+    tags=["meta"]
+)
+
+ENCODING_SUFFIX = {"gzip": "-gz", "br": "-br"}
+
+# === Вспомогательные функции ===
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Сравнивает If-None-Match с текущим ETag. Суффикс кодировки игнорируется:
+    gzip- и br-версии одного поколения меты считаются одинаковыми.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        candidate = candidate.removeprefix("W/").strip('"')
+        for suffix in ENCODING_SUFFIX.values():
+            candidate = candidate.removesuffix(suffix)
+        if candidate == etag:
+            return True
+    return False
+
+
+def _meta_response(request: Request, variant: str, fields: Optional[str], role: Optional[str], since: Optional[int]) -> Response:
+    try:
+        snapshot = get_snapshot()
+    except FileNotFoundError as fnf:
+        logger.error("📂 meta.json не найден: %s", fnf)
+        raise HTTPException(status_code=500, detail="Файл с мета-данными не найден.")
+
+    try:
+        parsed_fields = parse_fields(fields)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    if since is not None and since > snapshot.generation:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Поколение {since} ещё не существует. Текущее поколение: {snapshot.generation}."
+        )
+
+    # ETag зависит от поколения меты и от варианта запроса (поля, роль, since)
+    etag = f"{snapshot.etag}-{variant}"
+    headers = {
+        "Cache-Control": "public, no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Meta-Generation": str(snapshot.generation),
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        headers["ETag"] = f'"{etag}"'
+        return Response(status_code=304, headers=headers)
+
+    role_key = role.strip().lower() if role else None
+    rendered = render(snapshot, parsed_fields, role_key, since)
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    body = rendered.for_encoding(encoding)
+
+    if body is not rendered.identity:
+        headers["Content-Encoding"] = encoding
+        etag += ENCODING_SUFFIX[encoding]
+    headers["ETag"] = f'"{etag}"'
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _variant_key(fields: Optional[str], role: Optional[str], since: Optional[int] = None) -> str:
+    parts = [
+        ",".join(parse_fields(fields)) if fields else "all",
+        role.strip().lower() if role else "any",
+    ]
+    if since is not None:
+        parts.append(f"since{since}")
+    return "_".join(parts).replace(" ", "")
+
+# === Роуты ===
+
+@router.get(
+    "",
+    summary="📊 Мета-статистика героев",
+    description=(
+        "Отдаёт мету из памяти сервера. Поддерживает ETag/If-None-Match (304 при неизменной мете), "
+        "gzip/brotli, проекцию полей (?fields=winrate,roles) и фильтр по роли (?role=carry)."
+    ),
+)
+async def get_meta(
+    request: Request,
+    fields: Optional[str] = Query(default=None, description="Список полей через запятую"),
+    role: Optional[str] = Query(default=None, description="Роль героя, например carry или support"),
+):
+    try:
+        variant = _variant_key(fields, role)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    return _meta_response(request, variant, fields, role, None)
+
+
+@router.get(
+    "/delta",
+    summary="🔁 Изменения меты с указанного поколения",
+    description="Возвращает только героев, чьи данные изменились после поколения since.",
+)
+async def get_meta_delta(
+    request: Request,
+    since: int = Query(..., ge=0, description="Поколение меты, которое уже есть у клиента"),
+    fields: Optional[str] = Query(default=None, description="Список полей через запятую"),
+    role: Optional[str] = Query(default=None, description="Роль героя, например carry или support"),
+):
+    try:
+        variant = _variant_key(fields, role, since)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    return _meta_response(request, variant, fields, role, since)
+
+
+@router.get(
+    "/trending",
+    summary="📈 Герои на подъёме",
+    description=(
+        "Считает тренды по колоночной истории меты: изменение метрики, скользящие средние "
+        "и изменение места в рейтинге за последние window снимков. Фильтр по роли — ?role=carry."
+    ),
+)
+async def get_trending(
+    role: Optional[str] = Query(default=None, description="Роль героя, например carry или support"),
+    metric: str = Query(default="winrate", description=f"Метрика: {', '.join(METRICS)}"),
+    window: int = Query(default=3, ge=1, le=100, description="Окно в снимках меты"),
+    limit: int = Query(default=10, ge=1, le=50),
+):
+    heroes = None
+    if role:
+        try:
+            snapshot = get_snapshot()
+        except FileNotFoundError as fnf:
+            logger.error("📂 meta.json не найден: %s", fnf)
+            raise HTTPException(status_code=500, detail="Файл с мета-данными не найден.")
+        role_l = role.strip().lower()
+        heroes = [
+            name for name, info in snapshot.heroes.items()
+            if role_l in (r.lower() for r in info.get("roles", []))
+        ]
+
+    try:
+        trending = trending_heroes(metric=metric, window=window, limit=limit, heroes=heroes)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    return {"metric": metric, "window": window, "role": role, "heroes": trending}
@@ -0,0 +1,150 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Tuple
+
+from models.types import (
+    BanRecommendationResponse,
+    BanSuggestion,
+    BatchPredictionInput,
+    BatchPredictionResponse,
+    DraftPrediction,
+    DraftInput,
+    DraftPredictionInput,
+)
+from services.draft_model import predict_drafts, rank_bans, resolve_heroes
+from services.hero_data import load_hero_matrices
+
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+router = APIRouter(
+    prefix="/predict",
+    tags=["prediction"]
+)
+
+# === Вспомогательные функции ===
+
+def _resolve_draft(draft: DraftPredictionInput) -> Tuple[List[int], List[int]]:
+    allies, unknown_allies = resolve_heroes(draft.ally_heroes)
+    enemies, unknown_enemies = resolve_heroes(draft.enemy_heroes)
+    unknown = unknown_allies + unknown_enemies
+    if unknown:
+        raise ValueError(f"Неизвестные герои: {', '.join(unknown)}")
+    if set(allies) & set(enemies):
+        raise ValueError("Один и тот же герой не может быть в обеих командах.")
+    return allies, enemies
+
+
+def _load_matrices():
+    try:
+        return load_hero_matrices()
+    except FileNotFoundError as fnf:
+        logger.error("📂 Данные героев не найдены: %s", fnf)
+        raise HTTPException(status_code=500, detail="Файл с мета-данными не найден.")
+
+
+def _probability(logit: float) -> float:
+    return 1.0 / (1.0 + math.exp(-logit))
+
+# === Роуты ===
+
+@router.post(
+    "/draft",
+    response_model=DraftPrediction,
+    summary="🎲 Вероятность победы для драфта",
+    description=(
+        "Логистическая модель по силе героев, матчапам и синергии. Команды могут быть неполными — "
+        "каждый пустой слот расширяет доверительный интервал."
+    ),
+)
+async def predict_draft(draft: DraftPredictionInput):
+    try:
+        allies, enemies = _resolve_draft(draft)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    matrices = _load_matrices()
+    score = predict_drafts([allies], [enemies], matrices)
+    return DraftPrediction(
+        win_probability=round(float(score.probability[0]), 4),
+        confidence_interval=[round(float(score.low[0]), 4), round(float(score.high[0]), 4)],
+        logit=round(float(score.logit[0]), 4),
+        breakdown={
+            "strength": round(float(score.strength[0]), 4),
+            "matchup": round(float(score.matchup[0]), 4),
+            "synergy": round(float(score.synergy[0]), 4),
+        },
+        generation=matrices.generation,
+    )
+
+
+@router.post(
+    "/draft/batch",
+    response_model=BatchPredictionResponse,
+    summary="📦 Пакетная оценка драфтов",
+    description="Оценивает до 10 000 гипотетических драфтов одним векторизованным вычислением.",
+)
+async def predict_draft_batch(batch: BatchPredictionInput):
+    allies, enemies = [], []
+    for i, draft in enumerate(batch.drafts):
+        try:
+            a, e = _resolve_draft(draft)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=f"Драфт #{i}: {ve}")
+        allies.append(a)
+        enemies.append(e)
+
+    matrices = _load_matrices()
+    score = predict_drafts(allies, enemies, matrices)
+    return BatchPredictionResponse(
+        win_probabilities=score.probability.astype(float).round(4).tolist(),
+        confidence_intervals=[
+            list(pair) for pair in zip(score.low.astype(float).round(4).tolist(), score.high.astype(float).round(4).tolist())
+        ],
+        generation=matrices.generation,
+    )
+
+
+@router.post(
+    "/bans",
+    response_model=BanRecommendationResponse,
+    summary="🚫 Рекомендация банов",
+    description=(
+        "Оценивает каждый возможный пик врага против каждого нашего ответа (матрица героев × героев) "
+        "и возвращает героев, чей пик сильнее всего ухудшит наш драфт. Учитывает пики и баны."
+    ),
+)
+async def recommend_bans(
+    draft: DraftInput,
+    top_k: int = Query(default=5, ge=1, le=20),
+):
+    allies, unknown_allies = resolve_heroes(draft.ally_heroes + ([draft.user_hero] if draft.user_hero else []))
+    enemies, unknown_enemies = resolve_heroes(draft.enemy_heroes)
+    banned, _ = resolve_heroes(draft.banned_heroes)
+    unknown = unknown_allies + unknown_enemies
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Неизвестные герои: {', '.join(unknown)}")
+
+    matrices = _load_matrices()
+    base, candidates = rank_bans(allies, enemies, banned, top_k, matrices)
+    names = matrices.names
+    return BanRecommendationResponse(
+        current_win_probability=round(_probability(base), 4),
+        bans=[
+            BanSuggestion(
+                hero=names[c.hero],
+                threat=round(c.threat, 4),
+                win_probability_if_picked=round(_probability(c.value), 4),
+                best_response=names[c.best_response] if c.best_response >= 0 else None,
+                breakdown={
+                    "strength": round(c.strength, 4),
+                    "counter": round(c.counter, 4),
+                    "synergy": round(c.synergy, 4),
+                },
+            )
+            for c in candidates
+        ],
+        generation=matrices.generation,
+    )
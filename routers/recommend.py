@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from models.types import DraftInput, RecommendationResponse
 from services.logic import generate_recommendation
 from services.openai_generator import generate_openai_recommendation
+from services.admission import AdmissionRejected, run_admitted
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi import Limiter
@@ -20,6 +21,12 @@ router = APIRouter(
 # === Ограничение по IP ===
 limiter = Limiter(key_func=get_remote_address)
 
+
+def _degraded_recommendation(draft: DraftInput) -> RecommendationResponse:
+    result = generate_recommendation(draft)
+    result.warnings.append("⚠️ Сервер перегружен — ответ сгенерирован без OpenAI.")
+    return result
+
 @router.post(
     "/recommend",
     response_model=RecommendationResponse,
@@ -50,7 +57,13 @@ async def recommend_team(
         if use_openai:
             logger.info("🧠 Используется OpenAI как адаптер билдов")
             try:
-                result = generate_openai_recommendation(draft)
+                result = await run_admitted(
+                    generate_openai_recommendation,
+                    draft,
+                    degrade=lambda: _degraded_recommendation(draft),
+                )
+            except AdmissionRejected:
+                raise
             except Exception as ai_error:
                 logger.warning("⚠️ OpenAI упал: %s", ai_error)
                 logger.info("⛑️ Переход на fallback-логику")
@@ -62,6 +75,10 @@ async def recommend_team(
         logger.info("✅ Рекомендация готова")
         return result
 
+    except AdmissionRejected as rejected:
+        logger.warning("🚦 Запрос отклонён очередью: %s", rejected.reason)
+        raise
+
     except ValueError as ve:
         logger.warning("❌ Неверные входные данные: %s", ve)
         raise HTTPException(status_code=400, detail=str(ve))
@@ -0,0 +1,99 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+
+# === Константы ===
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+HEROES_FILE = DATA_DIR / "heroes.json"
+OUTPUT_FILE = DATA_DIR / "hero_matrices.npz"
+API_URL = "https://api.opendota.com/api"
+PRIOR_GAMES = 50  # сглаживание: столько «виртуальных» игр с винрейтом 50%
+
+
+# === Загрузка матчапов с OpenDota ===
+def fetch_matchups(delay: float):
+    print("📥 Загружаем список героев с OpenDota...")
+    try:
+        response = requests.get(f"{API_URL}/heroes", timeout=10)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ Ошибка при получении героев: {e}")
+        sys.exit(1)
+
+    id_to_name = {h["id"]: h["name"].lower().removeprefix("npc_dota_hero_") for h in response.json()}
+    matchups = {}
+    for hero_id, name in id_to_name.items():
+        try:
+            r = requests.get(f"{API_URL}/heroes/{hero_id}/matchups", timeout=10)
+            r.raise_for_status()
+            matchups[name] = [
+                (id_to_name[m["hero_id"]], m["wins"], m["games_played"])
+                for m in r.json() if m["hero_id"] in id_to_name
+            ]
+            print(f"  ✅ {name}: {len(matchups[name])} матчапов")
+        except requests.RequestException as e:
+            print(f"  ⚠️ {name}: {e}")
+        time.sleep(delay)
+    return matchups
+
+
+# === Построение матриц ===
+def build_matrices(names: list, matchups: dict) -> dict:
+    index = {n: i for i, n in enumerate(names)}
+    size = len(names)
+    wins = np.zeros((size, size))
+    games = np.zeros((size, size))
+    for hero, rows in matchups.items():
+        if hero not in index:
+            continue
+        for enemy, w, g in rows:
+            if enemy in index:
+                wins[index[hero], index[enemy]] += w
+                games[index[hero], index[enemy]] += g
+
+    smoothed = (wins + PRIOR_GAMES * 0.5) / (games + PRIOR_GAMES)
+    advantage = np.log(smoothed / (1 - smoothed))
+
+    # Общая сила героя уже учитывается отдельно: в матчапе оставляем только остаток
+    strength = np.log(
+        (wins.sum(1) + PRIOR_GAMES * 0.5) / (games.sum(1) + PRIOR_GAMES)
+        / (1 - (wins.sum(1) + PRIOR_GAMES * 0.5) / (games.sum(1) + PRIOR_GAMES))
+    )
+    residual = advantage - (strength[:, None] - strength[None, :])
+    matchup = (residual - residual.T) / 2
+    np.fill_diagonal(matchup, 0)
+
+    return {
+        "names": np.array(names),
+        "matchup": matchup.astype(np.float32),
+        "synergy": np.zeros((size, size), dtype=np.float32),
+        "games": (games + games.T).astype(np.float32),
+    }
+
+
+# === Точка входа ===
+def main():
+    parser = argparse.ArgumentParser(description="Собрать матрицы матчапов героев для /predict")
+    parser.add_argument("--delay", type=float, default=1.0, help="Пауза между запросами к OpenDota, секунды")
+    args = parser.parse_args()
+
+    with open(HEROES_FILE, encoding="utf-8") as f:
+        names = [h["name"].lower() for h in json.load(f)]
+
+    matchups = fetch_matchups(args.delay)
+    if not matchups:
+        print("⚠️ Матчапы не получены — файл не обновлён.")
+        return
+
+    arrays = build_matrices(names, matchups)
+    np.savez_compressed(OUTPUT_FILE, **arrays)
+    print(f"✅ Матрицы сохранены в {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, HTTPException, Request
+
+# === Локальная заглушка OpenAI Chat Completions ===
+# Запуск:  python -m scripts.fake_openai --port 9100 --latency 1.5
+# Приложение: OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=sk-fake uvicorn main:app
+
+RECOMMENDATION = {
+    "recommended_aspect": "utility",
+    "suggested_heroes": [
+        {"name": "lion", "score": 0.71, "reason": "Надёжный контроль против подвижных героев."},
+        {"name": "shadow_shaman", "score": 0.68, "reason": "Пуш и двойной контроль."},
+        {"name": "witch_doctor", "score": 0.66, "reason": "Сильный урон по площади."},
+    ],
+    "lane_opponents": [],
+    "builds": [],
+    "source": "openai",
+}
+
+BUILD_OPTIONS = [
+    {"id": "magic_burst", "label": "Магический бурст", "description": "Максимум урона от способностей."},
+    {"id": "tempo_control", "label": "Темп и контроль", "description": "Ранние ганги и контроль карты."},
+    {"id": "late_utility", "label": "Поздняя поддержка", "description": "Ауры и сейвы для команды."},
+]
+
+DETAILED_BUILD = {
+    "starting_items": ["tango", "branches", "faerie_fire"],
+    "early_game_items": ["boots", "magic_wand"],
+    "mid_game_items": ["kaya", "black_king_bar"],
+    "late_game_items": ["octarine_core", "refresher"],
+    "situational_items": ["lotus_orb", "ghost_scepter"],
+    "skill_build": ["Q", "W", "Q", "E", "Q", "R", "Q", "W", "W", "W"],
+    "talents": {"10": "+20 урона", "15": "+8% усиления заклинаний", "20": "+300 здоровья", "25": "-20с перезарядки"},
+    "game_plan": {
+        "early_game": "Выиграй линию и получи уровень 6 раньше соперника.",
+        "mid_game": "Ищи драки рядом с союзниками.",
+        "late_game": "Держись позади и используй способности по приоритетным целям.",
+    },
+    "item_explanations": {"black_king_bar": "Защита от контроля.", "kaya": "Усиление заклинаний."},
+    "warnings": [],
+    "builds": [],
+    "source": "openai",
+}
+
+# Разделы подробного билда (items/skills/lane/strategy) берут нужные поля из одного объекта
+SECTIONS = {**DETAILED_BUILD, "early_game": "Выиграй линию и получи уровень 6 раньше соперника."}
+
+
+def pick_content(messages: list) -> str:
+    prompt = " ".join(m.get("content", "") for m in messages)
+    if "BuildVariant" in prompt:
+        return json.dumps(BUILD_OPTIONS, ensure_ascii=False)
+    if "DetailedBuildResponse" in prompt:
+        return json.dumps(DETAILED_BUILD, ensure_ascii=False)
+    if "suggested_heroes" in prompt:
+        return json.dumps(RECOMMENDATION, ensure_ascii=False)
+    return json.dumps(SECTIONS, ensure_ascii=False)
+
+
+def create_app(latency: float, jitter: float, error_rate: float, model_latency: dict) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    app.state.calls = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "gpt-4o")
+        app.state.calls += 1
+
+        delay = model_latency.get(model, latency) + random.uniform(0, jitter)
+        await asyncio.sleep(delay)
+
+        if random.random() < error_rate:
+            raise HTTPException(status_code=500, detail="fake upstream error")
+
+        content = pick_content(body.get("messages", []))
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"calls": app.state.calls}
+
+    return app
+
+
+def parse_model_latency(values: list) -> dict:
+    result = {}
+    for value in values or []:
+        model, _, seconds = value.partition("=")
+        result[model] = float(seconds)
+    return result
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Локальная заглушка OpenAI для нагрузочного тестирования")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=1.0, help="Базовая задержка ответа, секунды")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Случайная добавка к задержке, секунды")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов с ошибкой 500")
+    parser.add_argument("--model-latency", action="append", metavar="MODEL=SECONDS",
+                        help="Задержка для конкретной модели, например gpt-4o-mini=0.4")
+    args = parser.parse_args()
+
+    app = create_app(args.latency, args.jitter, args.error_rate, parse_model_latency(args.model_latency))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
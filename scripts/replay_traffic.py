@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+import numpy as np
+
+from services.traffic_capture import load_captures
+
+# === Replay захваченного трафика ===
+# Запуск:  python -m scripts.replay_traffic captures/*.jsonl --target http://127.0.0.1:8000 --speed 10
+
+
+def schedule(records: List[dict], speed: float, rate: Optional[float]) -> List[float]:
+    """Смещения отправки (секунды от старта): исходные интервалы, сжатые в speed раз, или равномерно при --rate."""
+    if rate:
+        return [i / rate for i in range(len(records))]
+    start = records[0]["ts"]
+    return [(r["ts"] - start) / speed for r in records]
+
+
+async def fetch_metrics(client: httpx.AsyncClient) -> dict:
+    try:
+        response = await client.get("/metrics", timeout=5)
+        return response.json().get("counters", {})
+    except Exception:
+        return {}
+
+
+def cache_ratio(before: dict, after: dict) -> Optional[float]:
+    def delta(key: str) -> float:
+        return after.get(key, 0) - before.get(key, 0)
+
+    hits = delta("cache_requests_total{result=hit}")
+    total = hits + delta("cache_requests_total{result=miss}") + delta("cache_requests_total{result=error}")
+    return hits / total if total else None
+
+
+async def replay(records: List[dict], target: str, speed: float, rate: Optional[float],
+                 concurrency: int, timeout: float) -> dict:
+    offsets = schedule(records, speed, rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], Counter()
+
+    async with httpx.AsyncClient(base_url=target, timeout=timeout) as client:
+        before = await fetch_metrics(client)
+        started = time.perf_counter()
+
+        async def send(record: dict, offset: float):
+            delay = offset - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+                t0 = time.perf_counter()
+                try:
+                    response = await client.request(record["method"], url, json=record.get("body"))
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - t0)
+
+        await asyncio.gather(*(send(r, o) for r, o in zip(records, offsets)))
+        elapsed = time.perf_counter() - started
+        after = await fetch_metrics(client)
+
+    lat = np.array(latencies) * 1000
+    errors = sum(n for code, n in statuses.items() if not (isinstance(code, int) and code < 400))
+    ratio = cache_ratio(before, after)
+    return {
+        "requests": len(records),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(records) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {
+            "p50": round(float(np.percentile(lat, 50)), 1),
+            "p95": round(float(np.percentile(lat, 95)), 1),
+            "p99": round(float(np.percentile(lat, 99)), 1),
+            "max": round(float(lat.max()), 1),
+        },
+        "error_rate": round(errors / len(records), 4),
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "cache_hit_ratio": round(ratio, 4) if ratio is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизвести захваченный трафик против запущенного API")
+    parser.add_argument("files", nargs="+", type=Path, help="JSONL-файлы из captures/")
+    parser.add_argument("--target", default="http://127.0.0.1:8000", help="Базовый URL приложения")
+    parser.add_argument("--speed", type=float, default=1.0, help="Сжатие времени: 10 — в 10 раз быстрее оригинала")
+    parser.add_argument("--rate", type=float, default=None, help="Фиксированная частота, запросов/с (вместо исходных интервалов)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Максимум одновременных запросов")
+    parser.add_argument("--loops", type=int, default=1, help="Сколько раз повторить захваченный трафик")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Таймаут одного запроса, секунды")
+    args = parser.parse_args()
+
+    records = load_captures(args.files)
+    if not records:
+        print("⚠️ Нет записей для воспроизведения.")
+        return
+
+    if args.loops > 1:
+        span = records[-1]["ts"] - records[0]["ts"] + 1
+        records = [dict(r, ts=r["ts"] + span * i) for i in range(args.loops) for r in records]
+
+    print(f"▶️ Воспроизводим {len(records)} запросов на {args.target}...")
+    report = asyncio.run(replay(records, args.target, args.speed, args.rate, args.concurrency, args.timeout))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+# === Настройки ===
+ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", "8"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+ADMISSION_OVERFLOW = os.getenv("ADMISSION_OVERFLOW", "reject")  # reject | degrade
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Сервер перегружен ({reason}). Повторите через {retry_after} с.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+# === Ограничитель одновременных LLM-запросов ===
+
+class AdmissionController:
+    """
+    Ограниченная очередь перед генерацией через OpenAI: не больше concurrency
+    одновременных генераций, не больше max_queue ожидающих и не дольше max_wait секунд ожидания.
+    """
+
+    def __init__(self, concurrency: int, max_queue: int, max_wait: float):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self._service_time = 5.0  # EMA длительности генерации, секунды
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+            self.active = self.waiting = 0
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._service_time * (self.waiting + 1) / self.concurrency))
+
+    def _publish(self) -> None:
+        metrics.set_gauge("admission_active", self.active)
+        metrics.set_gauge("admission_queue_depth", self.waiting)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        metrics.inc("admission_rejected_total", reason=reason)
+        return AdmissionRejected(reason, self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self):
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self.waiting >= self.max_queue:
+            raise self._reject("queue_full")
+
+        self.waiting += 1
+        self._publish()
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            raise self._reject("wait_timeout")
+        finally:
+            self.waiting -= 1
+            metrics.observe("admission_wait_seconds", time.perf_counter() - queued_at)
+
+        self.active += 1
+        self._publish()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._service_time = 0.8 * self._service_time + 0.2 * (time.perf_counter() - started)
+            self.active -= 1
+            semaphore.release()
+            self._publish()
+
+
+controller = AdmissionController(ADMISSION_CONCURRENCY, ADMISSION_MAX_QUEUE, ADMISSION_MAX_WAIT)
+
+
+async def run_admitted(fn: Callable, *args, degrade: Optional[Callable] = None, **kwargs):
+    """
+    Выполняет блокирующую генерацию в пуле потоков, заняв место в очереди.
+    При переполнении либо пробрасывает AdmissionRejected (→ 429), либо,
+    если ADMISSION_OVERFLOW=degrade, возвращает результат degrade() — fallback-логику.
+    """
+    try:
+        async with controller.slot():
+            return await run_in_threadpool(fn, *args, **kwargs)
+    except AdmissionRejected as rejected:
+        if ADMISSION_OVERFLOW == "degrade" and degrade is not None:
+            logger.warning(f"⛑️ Очередь переполнена ({rejected.reason}) — ответ через fallback-логику")
+            metrics.inc("admission_degraded_total", reason=rejected.reason)
+            return degrade()
+        raise
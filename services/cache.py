@@ -1,13 +1,33 @@
+import hashlib
 import json
 from pathlib import Path
 from typing import Optional, Dict
 
+from services import metrics
+
 CACHE_DIR = Path("cache")
 CACHE_DIR.mkdir(exist_ok=True)
 
+def make_cache_key(prefix: str, *parts) -> str:
+    """
+    Ключ кэша из произвольных частей (герой, аспект, список героев и т.п.).
+    Списки сортируются, чтобы порядок героев в драфте не влиял на ключ.
+    """
+    normalized = [
+        ",".join(sorted(str(p).lower() for p in part)) if isinstance(part, (list, tuple, set)) else str(part).lower()
+        for part in parts
+    ]
+    digest = hashlib.sha1("|".join(normalized).encode("utf-8")).hexdigest()[:16]
+    return f"{prefix}_{digest}"
+
+
 def _get_cache_path(build_id: str) -> Path:
     return CACHE_DIR / f"{build_id}.json"
 
+def is_cached(build_id: str) -> bool:
+    return _get_cache_path(build_id).exists()
+
+
 def save_build_to_cache(build_id: str, data: Dict) -> None:
     path = _get_cache_path(build_id)
     with open(path, "w", encoding="utf-8") as f:
@@ -16,9 +36,13 @@ def save_build_to_cache(build_id: str, data: Dict) -> None:
 def load_build_from_cache(build_id: str) -> Optional[Dict]:
     path = _get_cache_path(build_id)
     if not path.exists():
+        metrics.inc("cache_requests_total", result="miss")
         return None
     try:
         with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            data = json.load(f)
+        metrics.inc("cache_requests_total", result="hit")
+        return data
     except Exception:
+        metrics.inc("cache_requests_total", result="error")
         return None
@@ -0,0 +1,170 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from services.hero_data import HeroMatrices, hero_id, load_hero_matrices
+
+TEAM_SIZE = 5
+MODEL_SIGMA = float(os.getenv("DRAFT_MODEL_SIGMA", "0.25"))  # базовая неопределённость модели, логиты
+Z_95 = 1.96
+
+# === Логистическая модель драфта ===
+# logit P(союзники победят) = Σ сила(союзники) − Σ сила(враги)
+#                           + Σ матчап(союзник, враг)
+#                           + Σ синергия(пары союзников) − Σ синергия(пары врагов)
+
+
+@dataclass(frozen=True)
+class DraftScore:
+    probability: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    logit: np.ndarray
+    strength: np.ndarray
+    matchup: np.ndarray
+    synergy: np.ndarray
+
+
+def resolve_heroes(names: Sequence[str]) -> Tuple[List[int], List[str]]:
+    ids, unknown = [], []
+    for name in names:
+        idx = hero_id(name)
+        if idx is None:
+            unknown.append(name)
+        elif idx not in ids:
+            ids.append(idx)
+    return ids, unknown
+
+
+def team_matrix(teams: Sequence[Sequence[int]], size: int) -> np.ndarray:
+    """Индикаторная матрица (drafts × heroes) без цикла по элементам."""
+    lengths = np.fromiter((len(t) for t in teams), dtype=np.intp, count=len(teams))
+    rows = np.repeat(np.arange(len(teams)), lengths)
+    cols = np.fromiter((h for t in teams for h in t), dtype=np.intp, count=int(lengths.sum()))
+    x = np.zeros((len(teams), size), dtype=np.float32)
+    x[rows, cols] = 1.0
+    return x
+
+
+@lru_cache(maxsize=4)
+def slot_variance(m: HeroMatrices) -> float:
+    """Дисперсия вклада одного неизвестного слота: разброс силы героя и его матчапов."""
+    offdiag = m.matchup[~np.eye(m.size, dtype=bool)]
+    return float(np.var(m.strength) + TEAM_SIZE * np.var(offdiag))
+
+
+def score_drafts(x_ally: np.ndarray, x_enemy: np.ndarray, m: HeroMatrices) -> DraftScore:
+    """
+    Оценивает сразу все драфты: x_ally, x_enemy — индикаторные матрицы (drafts × heroes).
+    Все слагаемые считаются матричными произведениями, без цикла по драфтам.
+    """
+    strength = x_ally @ m.strength - x_enemy @ m.strength
+    matchup = np.einsum("nh,nh->n", x_ally @ m.matchup, x_enemy)
+    synergy = 0.5 * (
+        np.einsum("nh,nh->n", x_ally @ m.synergy, x_ally)
+        - np.einsum("nh,nh->n", x_enemy @ m.synergy, x_enemy)
+    )
+    logit = strength + matchup + synergy
+
+    missing = (TEAM_SIZE - x_ally.sum(axis=1)) + (TEAM_SIZE - x_enemy.sum(axis=1))
+    sigma = np.sqrt(MODEL_SIGMA ** 2 + missing * slot_variance(m))
+
+    return DraftScore(
+        probability=_sigmoid(logit),
+        low=_sigmoid(logit - Z_95 * sigma),
+        high=_sigmoid(logit + Z_95 * sigma),
+        logit=logit,
+        strength=strength,
+        matchup=matchup,
+        synergy=synergy,
+    )
+
+
+def predict_drafts(
+    allies: Sequence[Sequence[int]],
+    enemies: Sequence[Sequence[int]],
+    m: HeroMatrices = None,
+) -> DraftScore:
+    m = m or load_hero_matrices()
+    return score_drafts(team_matrix(allies, m.size), team_matrix(enemies, m.size), m)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+# === Подбор банов ===
+
+@dataclass(frozen=True)
+class BanCandidate:
+    hero: int
+    value: float          # логит нашей победы, если враг возьмёт героя, после нашего лучшего ответа
+    threat: float         # насколько этот пик хуже для нас, чем типичный (медианный) пик врага
+    best_response: int    # -1, если у нас не осталось слотов
+    strength: float
+    counter: float
+    synergy: float
+
+
+def rank_bans(
+    allies: Sequence[int],
+    enemies: Sequence[int],
+    banned: Sequence[int],
+    top_k: int = 5,
+    m: HeroMatrices = None,
+) -> Tuple[float, List[BanCandidate]]:
+    """
+    Для каждого возможного пика врага e и каждого нашего ответа r считаем изменение логита
+        V[r, e] = R[r] + M[r, e] + E[e]
+    одной матрицей (heroes × heroes). Угроза героя — насколько упадёт наш логит,
+    если враг возьмёт его, а мы ответим лучшим доступным героем.
+    Возвращает текущий логит и top_k кандидатов в бан.
+    """
+    m = m or load_hero_matrices()
+    x_ally = team_matrix([allies], m.size)[0]
+    x_enemy = team_matrix([enemies], m.size)[0]
+    base = float(score_drafts(x_ally[None], x_enemy[None], m).logit[0])
+
+    available = np.ones(m.size, dtype=bool)
+    available[list(allies) + list(enemies) + list(banned)] = False
+    if len(enemies) >= TEAM_SIZE or not available.any():
+        return base, []
+
+    # Вклад героя e во вражеской команде (с нашей точки зрения)
+    e_strength = -m.strength
+    e_counter = x_ally @ m.matchup            # Σ_a M[a, e]: наше преимущество над e
+    e_synergy = -(m.synergy @ x_enemy)        # синергия e с уже взятыми врагами
+    enemy_gain = e_strength + e_counter + e_synergy
+
+    if len(allies) >= TEAM_SIZE:
+        values = enemy_gain
+        responses = np.full(m.size, -1)
+    else:
+        # Вклад нашего ответа r: сила, матчапы против врагов, синергия с союзниками
+        response_gain = m.strength + m.matchup @ x_enemy + m.synergy @ x_ally
+        pair = response_gain[:, None] + m.matchup + enemy_gain[None, :]
+        pair = np.where(available[:, None] & available[None, :], pair, -np.inf)
+        np.fill_diagonal(pair, -np.inf)
+        responses = np.argmax(pair, axis=0)
+        values = pair[responses, np.arange(m.size)]
+
+    typical = float(np.median(values[available]))
+    values = np.where(available, values, np.inf)
+    k = min(top_k, int(available.sum()))
+    top = np.argpartition(values, k - 1)[:k]
+    top = top[np.argsort(values[top], kind="stable")]
+
+    return base, [
+        BanCandidate(
+            hero=int(e),
+            value=base + float(values[e]),
+            threat=typical - float(values[e]),
+            best_response=int(responses[e]),
+            strength=float(m.strength[e]),
+            counter=float(-e_counter[e]),
+            synergy=float(-e_synergy[e]),
+        )
+        for e in top
+    ]
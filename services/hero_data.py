@@ -0,0 +1,117 @@
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from services.meta_store import get_snapshot
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+HEROES_PATH = DATA_DIR / "heroes.json"
+MATRICES_PATH = DATA_DIR / "hero_matrices.npz"
+
+# Имена, которые отличаются в heroes.json и meta.json
+HERO_ALIASES = {"zeus": "zuus"}
+
+# === Индекс героев ===
+
+@lru_cache(maxsize=1)
+def hero_names() -> Tuple[str, ...]:
+    """Порядок героев из heroes.json задаёт их числовые id во всех массивах."""
+    if not HEROES_PATH.exists():
+        raise FileNotFoundError(f"Файл {HEROES_PATH} не найден. Обнови через scripts/update_heroes.py.")
+    with open(HEROES_PATH, encoding="utf-8") as f:
+        return tuple(hero["name"].lower() for hero in json.load(f))
+
+
+@lru_cache(maxsize=1)
+def hero_ids() -> Dict[str, int]:
+    ids = {name: i for i, name in enumerate(hero_names())}
+    for alias, name in HERO_ALIASES.items():
+        if name in ids:
+            ids.setdefault(alias, ids[name])
+    return ids
+
+
+def hero_id(name: str) -> Optional[int]:
+    return hero_ids().get(name.strip().lower())
+
+# === Матрицы силы, матчапов и синергии ===
+
+@dataclass(frozen=True, eq=False)
+class HeroMatrices:
+    names: Tuple[str, ...]
+    strength: np.ndarray  # (H,) логит винрейта относительно среднего
+    matchup: np.ndarray   # (H, H) антисимметричная: преимущество i над j в логитах
+    synergy: np.ndarray   # (H, H) симметричная, нулевая диагональ
+    generation: int
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 0.01, 0.99)
+    return np.log(p / (1 - p))
+
+
+def _strength_from_meta(names: Tuple[str, ...], heroes: dict) -> np.ndarray:
+    ids = hero_ids()
+    winrates = np.full(len(names), np.nan)
+    for name, info in heroes.items():
+        idx = ids.get(name)
+        if idx is not None and info.get("winrate"):
+            winrates[idx] = info["winrate"]
+    strength = _logit(winrates)
+    known = np.isfinite(strength)
+    if known.any():
+        strength = strength - strength[known].mean()
+    return np.where(known, strength, 0.0).astype(np.float32)
+
+
+def _load_pairwise(names: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    size = len(names)
+    matchup = np.zeros((size, size), dtype=np.float32)
+    synergy = np.zeros((size, size), dtype=np.float32)
+    if not MATRICES_PATH.exists():
+        logger.warning(f"⚠️ {MATRICES_PATH.name} не найден — матчапы и синергия считаются нулевыми.")
+        return matchup, synergy
+
+    with np.load(MATRICES_PATH) as data:
+        stored = [str(n) for n in data["names"]]
+        ids = hero_ids()
+        # Пересобираем матрицы под текущий порядок heroes.json
+        src = np.array([i for i, n in enumerate(stored) if n in ids], dtype=np.intp)
+        dst = np.array([ids[stored[i]] for i in src], dtype=np.intp)
+        matchup[np.ix_(dst, dst)] = data["matchup"][np.ix_(src, src)]
+        synergy[np.ix_(dst, dst)] = data["synergy"][np.ix_(src, src)]
+
+    np.fill_diagonal(matchup, 0)
+    np.fill_diagonal(synergy, 0)
+    return matchup, synergy
+
+
+@lru_cache(maxsize=2)
+def _load_matrices(generation_etag: str) -> HeroMatrices:
+    snapshot = get_snapshot()
+    names = hero_names()
+    matchup, synergy = _load_pairwise(names)
+    logger.info(f"🧮 Матрицы героев загружены: {len(names)} героев, поколение меты {snapshot.generation}")
+    return HeroMatrices(
+        names=names,
+        strength=_strength_from_meta(names, snapshot.heroes),
+        matchup=matchup,
+        synergy=synergy,
+        generation=snapshot.generation,
+    )
+
+
+def load_hero_matrices() -> HeroMatrices:
+    """Матрицы пересчитываются только при смене снимка меты."""
+    return _load_matrices(get_snapshot().etag)
@@ -111,7 +111,8 @@ def generate_recommendation(draft: DraftInput) -> RecommendationResponse:
         warnings.append(f"⚠️ Герой '{user_hero}' не найден в базе. Игнорируется.")
         user_hero = None
 
-    excluded = set(clean_enemy + clean_ally)
+    clean_banned = clean_heroes(draft.banned_heroes, valid_heroes, 24, "банов")
+    excluded = set(clean_enemy + clean_ally + clean_banned)
     if user_hero:
         excluded.add(user_hero)
 
@@ -0,0 +1,264 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# === Пути и константы ===
+HISTORY_DIR = Path(__file__).resolve().parent.parent / "data" / "history"
+COLUMNS_PATH = HISTORY_DIR / "columns.json"
+TIMESTAMPS_PATH = HISTORY_DIR / "timestamps.f8"
+GENERATIONS_PATH = HISTORY_DIR / "generations.i4"
+
+METRICS = ("winrate", "pick_rate", "ban_rate")
+CAPACITY = 256  # фиксированная ширина строки: максимум героев в хранилище
+DTYPE = np.float32
+
+
+def _metric_path(metric: str) -> Path:
+    return HISTORY_DIR / f"{metric}.f4"
+
+# === Колонки героев ===
+
+def _load_columns() -> List[str]:
+    if not COLUMNS_PATH.exists():
+        return []
+    with open(COLUMNS_PATH, encoding="utf-8") as f:
+        return json.load(f)["heroes"]
+
+
+def _save_columns(heroes: List[str]) -> None:
+    tmp = COLUMNS_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"capacity": CAPACITY, "heroes": heroes}, f, ensure_ascii=False)
+    os.replace(tmp, COLUMNS_PATH)
+
+# === Запись снимков ===
+
+_write_lock = threading.Lock()
+
+
+def _row_count() -> int:
+    if not TIMESTAMPS_PATH.exists():
+        return 0
+    return TIMESTAMPS_PATH.stat().st_size // np.dtype(np.float64).itemsize
+
+
+def _truncate_to(rows: int) -> None:
+    """
+    Обрезает файлы метрик до числа записанных снимков.
+    Снимок считается записанным только после записи timestamp, поэтому
+    хвост от прерванной записи просто отбрасывается.
+    """
+    row_bytes = CAPACITY * np.dtype(DTYPE).itemsize
+    for metric in METRICS:
+        path = _metric_path(metric)
+        if path.exists() and path.stat().st_size != rows * row_bytes:
+            with open(path, "r+b") as f:
+                f.truncate(rows * row_bytes)
+    if GENERATIONS_PATH.exists():
+        with open(GENERATIONS_PATH, "r+b") as f:
+            f.truncate(rows * np.dtype(np.int32).itemsize)
+
+
+def append_snapshot(meta: dict) -> bool:
+    """
+    Дописывает текущую мету в колоночное хранилище (одна строка на снимок в каждом файле метрики).
+    Старые снимки не читаются и не перезаписываются.
+    """
+    generation = meta.get("_generation", 0)
+    heroes = {name: info for name, info in meta.items() if not name.startswith("_")}
+
+    with _write_lock:
+        HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        rows = _row_count()
+        _truncate_to(rows)
+
+        if rows and generation and GENERATIONS_PATH.exists():
+            last = np.fromfile(GENERATIONS_PATH, dtype=np.int32, offset=(rows - 1) * 4, count=1)
+            if last.size and last[0] == generation:
+                logger.info(f"⏭️ Поколение {generation} уже есть в истории меты")
+                return False
+
+        columns = _load_columns()
+        index = {name: i for i, name in enumerate(columns)}
+        new_heroes = [name for name in heroes if name not in index]
+        if len(columns) + len(new_heroes) > CAPACITY:
+            raise ValueError(f"❌ В истории меты не хватает колонок: {len(columns) + len(new_heroes)} > {CAPACITY}")
+        if new_heroes:
+            columns.extend(new_heroes)
+            index.update({name: i for i, name in enumerate(columns)})
+            _save_columns(columns)
+
+        cols = np.fromiter((index[name] for name in heroes), dtype=np.intp, count=len(heroes))
+        for metric in METRICS:
+            row = np.full(CAPACITY, np.nan, dtype=DTYPE)
+            row[cols] = [info.get(metric, np.nan) for info in heroes.values()]
+            with open(_metric_path(metric), "ab") as f:
+                f.write(row.tobytes())
+
+        with open(GENERATIONS_PATH, "ab") as f:
+            f.write(np.int32(generation).tobytes())
+
+        updated = meta.get("_last_updated")
+        timestamp = datetime.fromisoformat(updated).timestamp() if updated else datetime.utcnow().timestamp()
+        with open(TIMESTAMPS_PATH, "ab") as f:
+            f.write(np.float64(timestamp).tobytes())
+
+    logger.info(f"🗄️ Снимок меты (поколение {generation}) добавлен в историю: {rows + 1} снимков")
+    return True
+
+# === Чтение через memmap ===
+
+@dataclass(frozen=True)
+class MetaHistory:
+    heroes: List[str]
+    timestamps: np.ndarray
+    generations: np.ndarray
+    metrics: Dict[str, np.ndarray]  # metric -> memmap (snapshots × CAPACITY)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+_history: Optional[MetaHistory] = None
+_history_rows: int = -1
+
+
+def open_history() -> MetaHistory:
+    """
+    Открывает хранилище через np.memmap. Файлы не читаются целиком:
+    трендовые запросы трогают только последние строки.
+    """
+    global _history, _history_rows
+    rows = _row_count()
+    if _history is not None and rows == _history_rows:
+        return _history
+
+    heroes = _load_columns()
+    if rows == 0:
+        empty = np.empty((0, CAPACITY), dtype=DTYPE)
+        history = MetaHistory(heroes, np.empty(0), np.empty(0, dtype=np.int32), {m: empty for m in METRICS})
+    else:
+        history = MetaHistory(
+            heroes=heroes,
+            timestamps=np.memmap(TIMESTAMPS_PATH, dtype=np.float64, mode="r", shape=(rows,)),
+            generations=np.memmap(GENERATIONS_PATH, dtype=np.int32, mode="r", shape=(rows,)),
+            metrics={
+                m: np.memmap(_metric_path(m), dtype=DTYPE, mode="r", shape=(rows, CAPACITY))
+                for m in METRICS
+            },
+        )
+    _history, _history_rows = history, rows
+    return history
+
+# === Векторизованные тренды ===
+
+def deltas(values: np.ndarray, window: int) -> np.ndarray:
+    """Изменение метрики за window снимков для каждого героя."""
+    if len(values) <= window:
+        return np.full(values.shape[1], np.nan, dtype=DTYPE)
+    return values[-1] - values[-1 - window]
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Скользящее среднее по оси снимков (NaN пропускаются). Форма: (snapshots - window + 1) × heroes."""
+    finite = np.isfinite(values)
+    filled = np.where(finite, values, 0).astype(np.float64)
+    zero = np.zeros((1, values.shape[1]))
+    sums = np.concatenate([zero, np.cumsum(filled, axis=0)])
+    counts = np.concatenate([zero, np.cumsum(finite, axis=0)])
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (window_sums / window_counts).astype(DTYPE)
+
+
+def ranks(row: np.ndarray) -> np.ndarray:
+    """Место героя по метрике (1 — лучший). Отсутствующие герои — в конце."""
+    order = np.argsort(np.where(np.isfinite(row), -row, np.inf), kind="stable")
+    result = np.empty(len(row), dtype=np.int32)
+    result[order] = np.arange(1, len(row) + 1, dtype=np.int32)
+    return result
+
+
+def rank_changes(values: np.ndarray, window: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Изменение места героя за window снимков (положительное — герой поднялся)."""
+    if len(values) <= window:
+        return np.zeros(values.shape[1], dtype=np.int32)
+    current, previous = values[-1], values[-1 - window]
+    if mask is not None:
+        current = np.where(mask, current, np.nan)
+        previous = np.where(mask, previous, np.nan)
+    return ranks(previous) - ranks(current)
+
+
+def trending_heroes(
+    metric: str = "winrate",
+    window: int = 3,
+    limit: int = 10,
+    heroes: Optional[List[str]] = None,
+) -> List[dict]:
+    """
+    Герои с наибольшим ростом метрики: сравниваются скользящие средние
+    последних window снимков и window снимков до них.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Неизвестная метрика: {metric}. Доступны: {', '.join(METRICS)}")
+
+    history = open_history()
+    if len(history) < 2:
+        return []
+
+    tail = np.asarray(history.metrics[metric][-(2 * window + 1):])
+    mask = np.zeros(CAPACITY, dtype=bool)
+    index = {name: i for i, name in enumerate(history.heroes)}
+    wanted = heroes if heroes is not None else history.heroes
+    mask[[index[h] for h in wanted if h in index]] = True
+
+    effective = min(window, len(tail) - 1)
+    averages = moving_average(tail, effective)
+    trend = averages[-1] - averages[0] if len(averages) > 1 else deltas(tail, effective)
+    change = deltas(tail, effective)
+    rank_delta = rank_changes(tail, effective, mask)
+    current_rank = ranks(np.where(mask, tail[-1], np.nan))
+
+    score = np.where(mask & np.isfinite(trend), trend, -np.inf)
+    top = np.argsort(-score, kind="stable")[:limit]
+    top = top[np.isfinite(score[top])]
+
+    return [
+        {
+            "hero": history.heroes[i],
+            metric: round(float(tail[-1, i]), 4),
+            "delta": round(float(change[i]), 4),
+            "trend": round(float(trend[i]), 4),
+            "rank": int(current_rank[i]),
+            "rank_change": int(rank_delta[i]),
+        }
+        for i in top
+    ]
+
+# === CLI: засеять историю текущей метой ===
+def main():
+    from services.meta_loader import load_previous_meta
+
+    meta = load_previous_meta()
+    if not meta:
+        print("⚠️ meta.json не найден — нечего добавлять в историю.")
+        return
+    if append_snapshot(meta):
+        print(f"✅ Снимок добавлен в {HISTORY_DIR}")
+    else:
+        print("⏭️ Это поколение уже есть в истории.")
+
+
+if __name__ == "__main__":
+    main()
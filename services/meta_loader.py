@@ -3,6 +3,8 @@ import requests
 from pathlib import Path
 from datetime import datetime
 
+from services.meta_history import append_snapshot
+
 # === Пути и константы ===
 OUTPUT_PATH = Path(__file__).resolve().parent.parent / "data" / "meta.json"
 OPENDOTA_HERO_STATS_URL = "https://api.opendota.com/api/heroStats"
@@ -43,12 +45,47 @@ def transform_heroes(raw_heroes: list[dict]) -> dict:
     result["_last_updated"] = datetime.utcnow().isoformat()
     return result
 
+# === Поколения мета-данных ===
+def load_previous_meta() -> dict:
+    if not OUTPUT_PATH.exists():
+        return {}
+    try:
+        with open(OUTPUT_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def stamp_generation(meta: dict, previous: dict) -> list[str]:
+    """
+    Проставляет номер поколения меты и поколение последнего изменения каждого героя.
+    Возвращает список героев, данные которых изменились с прошлого обновления.
+    """
+    prev_generation = previous.get("_generation", 0)
+    prev_hero_generations = previous.get("_hero_generations", {})
+
+    changed = [
+        name for name, info in meta.items()
+        if not name.startswith("_") and previous.get(name) != info
+    ]
+    generation = prev_generation + 1 if changed else prev_generation
+
+    meta["_generation"] = generation
+    meta["_hero_generations"] = {
+        name: generation if name in changed else prev_hero_generations.get(name, prev_generation)
+        for name in meta
+        if not name.startswith("_")
+    }
+    return changed
+
 # === Сохранение мета-данных в файл ===
-def save_meta(data: dict, force: bool = True):
+def save_meta(data: dict, force: bool = True) -> list[str]:
+    changed = stamp_generation(data, load_previous_meta())
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"✅ meta.json успешно сохранён в {OUTPUT_PATH}")
+    print(f"✅ meta.json успешно сохранён в {OUTPUT_PATH} (поколение {data['_generation']}, изменено героев: {len(changed)})")
+    return changed
 
 # === CLI: ручной запуск ===
 def main():
@@ -61,6 +98,7 @@ def main():
     if raw:
         meta = transform_heroes(raw)
         save_meta(meta, force=args.force)
+        append_snapshot(meta)
     else:
         print("⚠️ Не удалось обновить meta.json — данные не получены.")
 
@@ -70,6 +108,7 @@ def fetch_and_save_meta() -> bool:
     if raw:
         meta = transform_heroes(raw)
         save_meta(meta)
+        append_snapshot(meta)
         return True
     return False
 
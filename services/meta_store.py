@@ -0,0 +1,160 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+META_PATH = Path(__file__).resolve().parent.parent / "data" / "meta.json"
+HERO_FIELDS = ("localized_name", "roles", "winrate", "pick_rate", "ban_rate")
+MIN_COMPRESS_SIZE = 512
+
+# === Снимок меты в памяти ===
+
+@dataclass(frozen=True, eq=False)
+class MetaSnapshot:
+    generation: int
+    etag: str
+    last_updated: Optional[str]
+    heroes: Dict[str, dict]
+    hero_generations: Dict[str, int] = field(default_factory=dict)
+
+
+_lock = threading.Lock()
+_snapshot: Optional[MetaSnapshot] = None
+_snapshot_mtime: Optional[int] = None
+
+
+def _build_snapshot(raw: bytes) -> MetaSnapshot:
+    data = json.loads(raw)
+    generation = data.get("_generation", 0)
+    heroes = {name: info for name, info in data.items() if not name.startswith("_")}
+    hero_generations = data.get("_hero_generations") or {name: generation for name in heroes}
+    digest = hashlib.sha1(raw).hexdigest()[:12]
+    return MetaSnapshot(
+        generation=generation,
+        etag=f"meta-{generation}-{digest}",
+        last_updated=data.get("_last_updated"),
+        heroes=heroes,
+        hero_generations=hero_generations,
+    )
+
+
+def get_snapshot() -> MetaSnapshot:
+    """
+    Возвращает мету из памяти. Файл перечитывается только если изменился его mtime,
+    поэтому запрос стоит один stat().
+    """
+    global _snapshot, _snapshot_mtime
+    if not META_PATH.exists():
+        raise FileNotFoundError(f"Файл {META_PATH} не найден. Запусти meta_loader.")
+
+    mtime = META_PATH.stat().st_mtime_ns
+    if _snapshot is not None and mtime == _snapshot_mtime:
+        return _snapshot
+
+    with _lock:
+        if _snapshot is None or mtime != _snapshot_mtime:
+            _snapshot = _build_snapshot(META_PATH.read_bytes())
+            _snapshot_mtime = mtime
+            logger.info(f"🔄 Мета загружена в память: поколение {_snapshot.generation}")
+    return _snapshot
+
+# === Проекция и фильтрация ===
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    if not fields:
+        return ()
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in HERO_FIELDS]
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(unknown)}. Доступны: {', '.join(HERO_FIELDS)}")
+    return requested
+
+
+def select_heroes(
+    snapshot: MetaSnapshot,
+    fields: Tuple[str, ...] = (),
+    role: Optional[str] = None,
+    since: Optional[int] = None,
+) -> Dict[str, dict]:
+    role_l = role.strip().lower() if role else None
+    result = {}
+    for name, info in snapshot.heroes.items():
+        if since is not None and snapshot.hero_generations.get(name, 0) <= since:
+            continue
+        if role_l and role_l not in (r.lower() for r in info.get("roles", [])):
+            continue
+        result[name] = {f: info.get(f) for f in fields} if fields else info
+    return result
+
+# === Сериализация и сжатие ===
+
+@dataclass(frozen=True)
+class RenderedBody:
+    identity: bytes
+    gzip: Optional[bytes]
+    br: Optional[bytes]
+
+    def for_encoding(self, encoding: Optional[str]) -> bytes:
+        if encoding == "br" and self.br is not None:
+            return self.br
+        if encoding == "gzip" and self.gzip is not None:
+            return self.gzip
+        return self.identity
+
+
+@lru_cache(maxsize=256)
+def render(
+    snapshot: MetaSnapshot,
+    fields: Tuple[str, ...],
+    role: Optional[str],
+    since: Optional[int],
+) -> RenderedBody:
+    """
+    Сериализует и сжимает ответ один раз на снимок меты и вариант запроса.
+    Снимок входит в ключ кэша, поэтому после обновления меты старые варианты вытесняются сами.
+    """
+    payload = {
+        "generation": snapshot.generation,
+        "last_updated": snapshot.last_updated,
+        "heroes": select_heroes(snapshot, fields, role, since),
+    }
+    if since is not None:
+        payload["since"] = since
+
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(body) < MIN_COMPRESS_SIZE:
+        return RenderedBody(identity=body, gzip=None, br=None)
+
+    return RenderedBody(
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=6, mtime=0),
+        br=brotli.compress(body, quality=9) if brotli else None,
+    )
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(token.strip().lower())
+    if brotli and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
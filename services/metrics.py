@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+import numpy as np
+
+# === Простой in-process реестр метрик ===
+# Счётчики, gauge-значения и гистограммы (окно последних наблюдений для перцентилей).
+# Отдаётся через GET /metrics в main.py.
+
+RESERVOIR_SIZE = 2048
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+_histograms: Dict[str, Tuple[list, Deque[float]]] = {}
+_started_at = time.time()
+
+
+def _key(name: str, labels: Dict[str, object]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{rendered}}}"
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = ([0, 0.0, 0.0], deque(maxlen=RESERVOIR_SIZE))
+        totals, window = hist
+        totals[0] += 1
+        totals[1] += value
+        totals[2] = max(totals[2], value)
+        window.append(value)
+
+
+def get_counter(name: str, **labels) -> float:
+    with _lock:
+        return _counters.get(_key(name, labels), 0)
+
+
+def snapshot() -> dict:
+    with _lock:
+        histograms = {}
+        for key, (totals, window) in _histograms.items():
+            values = np.fromiter(window, dtype=np.float64, count=len(window))
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) if len(values) else (0.0, 0.0, 0.0)
+            histograms[key] = {
+                "count": totals[0],
+                "sum": round(totals[1], 6),
+                "max": round(totals[2], 6),
+                "p50": round(float(p50), 6),
+                "p95": round(float(p95), 6),
+                "p99": round(float(p99), 6),
+            }
+        return {
+            "uptime_seconds": round(time.time() - _started_at, 1),
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "histograms": histograms,
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
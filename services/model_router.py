@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from services import metrics
+
+# === Политика моделей по задачам ===
+
+PRIMARY_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+WINDOW_SECONDS = float(os.getenv("OPENAI_ROUTER_WINDOW", "300"))
+MIN_SAMPLES = int(os.getenv("OPENAI_ROUTER_MIN_SAMPLES", "5"))
+MAX_ERROR_RATE = float(os.getenv("OPENAI_ROUTER_MAX_ERROR_RATE", "0.2"))
+
+# Цена за 1000 токенов (USD), используется только для метрик
+TOKEN_PRICES = {
+    "gpt-4o": 0.005,
+    "gpt-4o-mini": 0.0003,
+}
+
+
+@dataclass(frozen=True)
+class ModelPolicy:
+    primary: str
+    fallbacks: Tuple[str, ...]
+    latency_slo: float  # p95 в секундах
+
+
+def _policy(task: str, primary: str, fallbacks: Tuple[str, ...], slo: float) -> ModelPolicy:
+    env = task.upper()
+    return ModelPolicy(
+        primary=os.getenv(f"OPENAI_MODEL_{env}", primary),
+        fallbacks=tuple(m for m in os.getenv(f"OPENAI_FALLBACK_{env}", ",".join(fallbacks)).split(",") if m),
+        latency_slo=float(os.getenv(f"OPENAI_SLO_{env}", str(slo))),
+    )
+
+
+DEFAULT_POLICIES: Dict[str, ModelPolicy] = {
+    "recommend": _policy("recommend", PRIMARY_MODEL, (FAST_MODEL,), 8.0),
+    "build_options": _policy("build_options", FAST_MODEL, (), 3.0),
+    "detailed": _policy("detailed", PRIMARY_MODEL, (FAST_MODEL,), 12.0),
+    "section": _policy("section", PRIMARY_MODEL, (FAST_MODEL,), 5.0),
+}
+
+# === Статистика по моделям в скользящем окне ===
+
+@dataclass(frozen=True)
+class ModelStats:
+    count: int
+    p95_latency: float
+    error_rate: float
+    avg_tokens: float
+    cost_per_call: float
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        policies: Optional[Dict[str, ModelPolicy]] = None,
+        window_seconds: float = WINDOW_SECONDS,
+        min_samples: int = MIN_SAMPLES,
+        max_error_rate: float = MAX_ERROR_RATE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policies = policies or DEFAULT_POLICIES
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._observations: Dict[str, Deque[Tuple[float, float, bool, int]]] = {}
+
+    def record(self, model: str, latency: float, ok: bool, tokens: int = 0) -> None:
+        with self._lock:
+            self._observations.setdefault(model, deque(maxlen=1000)).append((self.clock(), latency, ok, tokens))
+        metrics.observe("openai_latency_seconds", latency, model=model)
+        metrics.inc("openai_calls_total", model=model, result="ok" if ok else "error")
+        if tokens:
+            metrics.inc("openai_tokens_total", tokens, model=model)
+            metrics.inc("openai_cost_usd_total", tokens / 1000 * TOKEN_PRICES.get(model, 0), model=model)
+
+    def stats(self, model: str) -> ModelStats:
+        horizon = self.clock() - self.window_seconds
+        with self._lock:
+            window = self._observations.get(model)
+            while window and window[0][0] < horizon:
+                window.popleft()
+            recent = list(window or ())
+
+        if not recent:
+            return ModelStats(0, 0.0, 0.0, 0.0, 0.0)
+
+        latencies = np.array([o[1] for o in recent])
+        errors = sum(1 for o in recent if not o[2])
+        avg_tokens = float(np.mean([o[3] for o in recent]))
+        return ModelStats(
+            count=len(recent),
+            p95_latency=float(np.percentile(latencies, 95)),
+            error_rate=errors / len(recent),
+            avg_tokens=avg_tokens,
+            cost_per_call=avg_tokens / 1000 * TOKEN_PRICES.get(model, 0),
+        )
+
+    def _healthy(self, stats: ModelStats, slo: float) -> bool:
+        # Мало наблюдений — модель считается здоровой: так основная модель
+        # снова получает трафик, когда старые медленные замеры выходят из окна.
+        if stats.count < self.min_samples:
+            return True
+        return stats.p95_latency <= slo and stats.error_rate <= self.max_error_rate
+
+    def choose(self, task: str) -> str:
+        policy = self.policies.get(task) or self.policies["recommend"]
+        candidates = (policy.primary, *policy.fallbacks)
+
+        chosen, reason = None, "primary"
+        for i, model in enumerate(candidates):
+            if self._healthy(self.stats(model), policy.latency_slo):
+                chosen, reason = model, "primary" if i == 0 else "slo_fallback"
+                break
+
+        if chosen is None:
+            # Все модели вне SLO — берём ту, у которой p95 сейчас меньше
+            chosen = min(candidates, key=lambda m: self.stats(m).p95_latency)
+            reason = "all_degraded"
+
+        metrics.inc("openai_route_total", task=task, model=chosen, reason=reason)
+        return chosen
+
+    def report(self) -> Dict[str, dict]:
+        with self._lock:
+            models = list(self._observations)
+        return {model: self.stats(model).__dict__ for model in models}
+
+
+router = ModelRouter()
@@ -4,8 +4,10 @@ import os
 import json
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from functools import lru_cache
 
 from dotenv import load_dotenv
@@ -23,15 +25,19 @@ from models.types import (
 )
 from services.logic import (
     generate_recommendation,
+    fallback_build_options,
     fallback_detailed_build,
 )
 from services.prompt_builder import PromptBuilder
-from services.cache import load_build_from_cache, save_build_to_cache
+from services.cache import load_build_from_cache, save_build_to_cache, make_cache_key, is_cached
+from services.model_router import router as model_router
 
 SCHEMA_PATH = Path(__file__).parent.parent / "models" / "openai_response_schema.json"
-MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 TEMPERATURE = float(os.getenv("OPENAI_TEMP", "0.7"))
 MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
+DETAILED_MODE = os.getenv("OPENAI_DETAILED_MODE", "sectioned")  # sectioned | monolithic
+SECTION_MAX_TOKENS = int(os.getenv("OPENAI_SECTION_MAX_TOKENS", "600"))
+SECTION_WORKERS = int(os.getenv("OPENAI_SECTION_WORKERS", "16"))
 
 logger = logging.getLogger(__name__)
 
@@ -63,11 +69,24 @@ def validate_openai_json(data: Dict) -> bool:
         return False
 
 
-def chat_completion(system_msg: str, user_msg: str, max_tokens: int = MAX_TOKENS) -> Optional[ChatCompletionMessage]:
+def chat_completion(
+    system_msg: str,
+    user_msg: str,
+    max_tokens: int = MAX_TOKENS,
+    task: str = "recommend",
+) -> Optional[ChatCompletionMessage]:
     try:
         client = get_openai_client()
+    except Exception as e:
+        logger.exception(f"💥 OpenAI error: {e}")
+        return None
+
+    # Модель выбирается по задаче и наблюдаемой задержке (services/model_router.py)
+    model = model_router.choose(task)
+    started = time.perf_counter()
+    try:
         response = client.chat.completions.create(
-            model=MODEL,
+            model=model,
             messages=[
                 {"role": "system", "content": system_msg},
                 {"role": "user", "content": user_msg},
@@ -75,9 +94,12 @@ def chat_completion(system_msg: str, user_msg: str, max_tokens: int = MAX_TOKENS
             temperature=TEMPERATURE,
             max_tokens=max_tokens,
         )
+        tokens = response.usage.total_tokens if response.usage else 0
+        model_router.record(model, time.perf_counter() - started, ok=True, tokens=tokens)
         return response.choices[0].message if response.choices else None
     except Exception as e:
-        logger.exception(f"💥 OpenAI error: {e}")
+        model_router.record(model, time.perf_counter() - started, ok=False)
+        logger.exception(f"💥 OpenAI error ({model}): {e}")
         return None
 
 # ---------------------------- Recommendation ----------------------------
@@ -86,7 +108,7 @@ def generate_openai_recommendation(draft: DraftInput) -> RecommendationResponse:
     builder = PromptBuilder()
     prompt = builder.build_recommend_prompt(draft)
 
-    response = chat_completion(system_msg=builder.templates["base"], user_msg=prompt)
+    response = chat_completion(system_msg=builder.templates["base"], user_msg=prompt, task="recommend")
     if not response:
         return generate_recommendation(draft)
 
@@ -123,7 +145,8 @@ def generate_build_options(
     response = chat_completion(
         system_msg="Ты помощник Dota 2. Твоя задача — предлагать билд-опции.",
         user_msg=user_prompt,
-        max_tokens=1000
+        max_tokens=1000,
+        task="build_options",
     )
 
     if not response:
@@ -150,6 +173,47 @@ def normalize_openai_detailed_response(parsed: Dict) -> Dict:
 
 
 def generate_detailed_build(
+    hero: str,
+    role: str,
+    aspect: str,
+    selected_build_id: str,
+    enemy_heroes: List[str],
+    ally_heroes: List[str],
+    mode: Optional[str] = None,
+) -> DetailedBuildResponse:
+    if (mode or DETAILED_MODE) == "sectioned":
+        return generate_detailed_build_sectioned(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+    return generate_detailed_build_monolithic(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+
+
+def is_detailed_build_cached(
+    hero: str,
+    role: str,
+    aspect: str,
+    selected_build_id: str,
+    enemy_heroes: List[str],
+    ally_heroes: List[str],
+    mode: Optional[str] = None,
+) -> bool:
+    """Можно ли собрать подробный билд целиком из кэша, без обращения к OpenAI."""
+    if (mode or DETAILED_MODE) == "sectioned":
+        keys = section_cache_keys(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+        return all(is_cached(key) for key in keys.values())
+    return is_cached(selected_build_id)
+
+
+def _fallback_detailed(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes) -> DetailedBuildResponse:
+    return fallback_detailed_build(
+        hero=hero,
+        role=role,
+        aspect=aspect,
+        enemy_lane_heroes=enemy_heroes,
+        team_heroes=ally_heroes,
+        selected_build_id=selected_build_id,
+    )
+
+
+def generate_detailed_build_monolithic(
     hero: str,
     role: str,
     aspect: str,
@@ -177,11 +241,12 @@ def generate_detailed_build(
     response = chat_completion(
         system_msg="Ты стратег в Dota 2. Возвращай подробный билд.",
         user_msg=user_prompt,
-        max_tokens=1500
+        max_tokens=1500,
+        task="detailed",
     )
 
     if not response:
-        return fallback_detailed_build(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+        return _fallback_detailed(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
 
     try:
         parsed = json.loads(extract_json_block(response.content))
@@ -190,11 +255,170 @@ def generate_detailed_build(
         parsed.setdefault("source", "openai")
         parsed.setdefault("builds", [])
 
-        if validate_openai_json(parsed):
-            save_build_to_cache(selected_build_id, parsed)
-
-        return DetailedBuildResponse(**parsed)
+        # Схема openai_response_schema.json описывает RecommendationResponse,
+        # поэтому подробный билд проверяем его собственной моделью.
+        build = DetailedBuildResponse(**parsed)
+        save_build_to_cache(selected_build_id, parsed)
+        return build
 
     except Exception as e:
         logger.exception(f"❌ Detailed build parsing failed: {e}")
-        return fallback_detailed_build(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+        return _fallback_detailed(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+
+# ---------------------------- Sectioned Detailed Build ----------------------------
+
+SECTION_SYSTEM_MSG = "Ты аналитик Dota 2. Отвечай строго одним JSON-объектом без пояснений."
+
+# Ожидаемые поля каждого раздела и их типы
+SECTION_FIELDS: Dict[str, Dict[str, type]] = {
+    "items": {
+        "starting_items": list,
+        "early_game_items": list,
+        "mid_game_items": list,
+        "late_game_items": list,
+        "situational_items": list,
+        "item_explanations": dict,
+    },
+    "skills": {"skill_build": list, "talents": dict},
+    "lane": {"early_game": str, "warnings": list},
+    "strategy": {"game_plan": dict, "warnings": list},
+}
+
+_section_pool = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix="openai-section")
+
+
+def section_cache_keys(
+    hero: str,
+    role: str,
+    aspect: str,
+    selected_build_id: str,
+    enemy_heroes: List[str],
+    ally_heroes: List[str],
+) -> Dict[str, str]:
+    """
+    Ключ каждого раздела содержит только то, от чего раздел зависит:
+    предметы — герой+аспект+вариант билда, навыки — герой,
+    линия — герой+враги, стратегия — весь драфт.
+    """
+    return {
+        "items": make_cache_key("items", hero, aspect, selected_build_id),
+        "skills": make_cache_key("skills", hero),
+        "lane": make_cache_key("lane", hero, enemy_heroes),
+        "strategy": make_cache_key("strategy", hero, role, ally_heroes, enemy_heroes),
+    }
+
+
+def build_section_specs(
+    builder: PromptBuilder,
+    hero: str,
+    role: str,
+    aspect: str,
+    selected_build_id: str,
+    enemy_heroes: List[str],
+    ally_heroes: List[str],
+) -> List[Tuple[str, str, str]]:
+    """Разделы подробного билда: (имя, ключ кэша, промпт)."""
+    keys = section_cache_keys(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+    return [
+        ("items", keys["items"], builder.build_items_prompt(hero, aspect, selected_build_id)),
+        ("skills", keys["skills"], builder.build_skills_prompt(hero)),
+        ("lane", keys["lane"], builder.build_lane_prompt(hero, enemy_heroes)),
+        ("strategy", keys["strategy"], builder.build_strategy_prompt(hero, ally_heroes, enemy_heroes, role)),
+    ]
+
+
+def validate_section(name: str, data: Dict) -> Optional[Dict]:
+    if not isinstance(data, dict):
+        return None
+    fields = SECTION_FIELDS[name]
+    section = {}
+    for key, expected in fields.items():
+        value = data.get(key)
+        if not isinstance(value, expected):
+            logger.warning(f"⚠️ Раздел {name}: поле {key} отсутствует или имеет неверный тип")
+            return None
+        section[key] = value
+    return section
+
+
+def generate_section(name: str, cache_key: str, prompt: str) -> Optional[Dict]:
+    cached = load_build_from_cache(cache_key)
+    if cached:
+        logger.info(f"✅ Section cache hit: {name} ({cache_key})")
+        return cached
+
+    response = chat_completion(system_msg=SECTION_SYSTEM_MSG, user_msg=prompt, max_tokens=SECTION_MAX_TOKENS, task="section")
+    if not response:
+        return None
+
+    try:
+        section = validate_section(name, json.loads(extract_json_block(response.content)))
+    except Exception as e:
+        logger.exception(f"❌ Section {name} parsing failed: {e}")
+        return None
+
+    if section:
+        save_build_to_cache(cache_key, section)
+    return section
+
+
+def merge_sections(sections: Dict[str, Optional[Dict]], fallback: DetailedBuildResponse) -> DetailedBuildResponse:
+    """
+    Собирает DetailedBuildResponse из разделов. Неудавшиеся разделы берутся из fallback.
+    """
+    merged = fallback.model_dump()
+    merged["warnings"] = []
+
+    items = sections.get("items")
+    if items:
+        merged.update(items)
+
+    skills = sections.get("skills")
+    if skills:
+        merged.update(skills)
+
+    strategy = sections.get("strategy")
+    if strategy:
+        merged["game_plan"] = dict(strategy["game_plan"])
+        merged["warnings"].extend(strategy["warnings"])
+
+    lane = sections.get("lane")
+    if lane:
+        merged["game_plan"] = {**merged["game_plan"], "early_game": lane["early_game"]}
+        merged["warnings"] = list(lane["warnings"]) + merged["warnings"]
+
+    failed = [name for name, section in sections.items() if not section]
+    for name in failed:
+        merged["warnings"].append(f"⚠️ Раздел «{name}» сгенерирован fallback-логикой.")
+
+    merged["source"] = "openai" if len(failed) < len(sections) else "fallback"
+    return DetailedBuildResponse(**merged)
+
+
+def generate_detailed_build_sectioned(
+    hero: str,
+    role: str,
+    aspect: str,
+    selected_build_id: str,
+    enemy_heroes: List[str],
+    ally_heroes: List[str]
+) -> DetailedBuildResponse:
+    """
+    Запускает промпты разделов параллельно: время ответа — самый медленный небольшой промпт,
+    а большинство разделов берутся из кэша.
+    """
+    specs = build_section_specs(PromptBuilder(), hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+    futures = {name: _section_pool.submit(generate_section, name, key, prompt) for name, key, prompt in specs}
+
+    sections = {}
+    for name, future in futures.items():
+        try:
+            sections[name] = future.result()
+        except Exception as e:
+            logger.exception(f"❌ Section {name} failed: {e}")
+            sections[name] = None
+
+    fallback = _fallback_detailed(hero, role, aspect, selected_build_id, enemy_heroes, ally_heroes)
+    if not any(sections.values()):
+        return fallback
+    return merge_sections(sections, fallback)
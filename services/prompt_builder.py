@@ -22,6 +22,16 @@ class PromptBuilder:
             raise FileNotFoundError(f"❌ Prompt file not found: {path}")
         return path.read_text(encoding="utf-8")
 
+    @staticmethod
+    def _fill(template: str, **values) -> str:
+        """
+        Подставляет {hero}, {aspect} и т.п. Шаблоны содержат JSON-примеры с фигурными
+        скобками, поэтому str.format не подходит — заменяем только известные ключи.
+        """
+        for key, value in values.items():
+            template = template.replace("{" + key + "}", str(value))
+        return template
+
     def build_recommend_prompt(self, draft: DraftInput) -> str:
         """
         Формирует промпт на основе DraftInput для генерации рекомендованных героев.
@@ -44,18 +54,18 @@ class PromptBuilder:
             f"- source: 'openai'\n"
         )
 
-    def build_items_prompt(self, hero: str, aspect: str) -> str:
-        return self.templates["items"].format(hero=hero, aspect=aspect)
+    def build_items_prompt(self, hero: str, aspect: str, build_id: str = "") -> str:
+        return self._fill(self.templates["items"], hero=hero, aspect=aspect, build=build_id or "универсальный")
 
     def build_lane_prompt(self, hero: str, enemies: list) -> str:
-        enemy_list = ", ".join(enemies)
-        return self.templates["lane"].format(hero=hero, enemies=enemy_list)
+        enemy_list = ", ".join(enemies) or "неизвестны"
+        return self._fill(self.templates["lane"], hero=hero, enemies=enemy_list)
 
     def build_skills_prompt(self, hero: str) -> str:
-        return self.templates["skills"].format(hero=hero)
+        return self._fill(self.templates["skills"], hero=hero)
 
-    def build_strategy_prompt(self, hero: str, allies: list, enemies: list) -> str:
-        allies_str = ", ".join(allies)
-        enemies_str = ", ".join(enemies)
-        return self.templates["strategy"].format(hero=hero, allies=allies_str, enemies=enemies_str)
+    def build_strategy_prompt(self, hero: str, allies: list, enemies: list, role: str = "") -> str:
+        allies_str = ", ".join(allies) or "неизвестны"
+        enemies_str = ", ".join(enemies) or "неизвестны"
+        return self._fill(self.templates["strategy"], hero=hero, role=role or "любая", allies=allies_str, enemies=enemies_str)
 
@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+# === Настройки ===
+CAPTURE_RATE = float(os.getenv("TRAFFIC_CAPTURE_RATE", "0"))
+CAPTURE_DIR = Path(os.getenv("TRAFFIC_CAPTURE_DIR", "captures"))
+CAPTURE_MAX_BYTES = int(float(os.getenv("TRAFFIC_CAPTURE_MAX_MB", "50")) * 1024 * 1024)
+CAPTURE_MAX_FILES = int(os.getenv("TRAFFIC_CAPTURE_MAX_FILES", "20"))
+CAPTURE_PATHS = ("/api/recommend", "/builds/")
+MAX_BODY_BYTES = 64 * 1024
+
+# === Фоновая запись в ротируемые JSONL-файлы ===
+
+class CaptureWriter:
+    """
+    Пишет записи в JSONL из отдельного потока. Запрос только кладёт запись в очередь;
+    если очередь переполнена, запись отбрасывается, а не тормозит ответ.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, max_files: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=10_000)
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc("traffic_capture_dropped_total")
+
+    def _open_new_file(self):
+        if self._file:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"traffic-{datetime.utcnow():%Y%m%d-%H%M%S-%f}.jsonl"
+        self._file = open(self.directory / name, "a", encoding="utf-8")
+        self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("traffic-*.jsonl"))
+        for old in files[:-self.max_files]:
+            old.unlink(missing_ok=True)
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if self._file is None or self._file.tell() >= self.max_bytes:
+                    self._open_new_file()
+                self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                if self._queue.empty():
+                    self._file.flush()
+                metrics.inc("traffic_capture_written_total")
+            except Exception as e:
+                logger.warning(f"⚠️ Не удалось записать захваченный запрос: {e}")
+
+# === ASGI middleware ===
+
+class TrafficCaptureMiddleware:
+    """
+    Сэмплирует запросы к /api/recommend и /builds/* и сохраняет их для replay.
+    Анонимизация: IP, заголовки и cookies не сохраняются — только метод, путь, query и тело.
+    Несэмплированные запросы проходят без какой-либо обёртки.
+    """
+
+    def __init__(self, app, sample_rate: float = CAPTURE_RATE, writer: Optional[CaptureWriter] = None,
+                 paths: tuple = CAPTURE_PATHS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.paths = paths
+        self.writer = writer or CaptureWriter(CAPTURE_DIR, CAPTURE_MAX_BYTES, CAPTURE_MAX_FILES)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.paths)
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        chunks: List[bytes] = []
+        status = {"code": 0}
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request" and sum(map(len, chunks)) < MAX_BODY_BYTES:
+                chunks.append(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            self.writer.submit(self._record(scope, b"".join(chunks), status["code"], started))
+
+    @staticmethod
+    def _record(scope, raw_body: bytes, status: int, started: float) -> dict:
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except ValueError:
+            body = None
+        return {
+            "ts": round(time.time(), 3),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "body": body,
+            "status": status,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+
+def load_captures(paths: List[Path]) -> List[dict]:
+    """Читает захваченные записи в порядке времени."""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return sorted(records, key=lambda r: r["ts"])
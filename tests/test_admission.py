@@ -0,0 +1,48 @@
+# tests/test_admission.py
+
+import asyncio
+
+import pytest
+
+from services.admission import AdmissionController, AdmissionRejected
+
+
+def test_admission_queue_limits():
+    async def scenario():
+        controller = AdmissionController(concurrency=1, max_queue=1, max_wait=0.2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert controller.active == 1 and controller.waiting == 1
+
+        # Очередь заполнена — отказ сразу, без ожидания
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.slot():
+                pass
+        assert rejected.value.reason == "queue_full"
+        assert rejected.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(holder, queued)
+        assert controller.active == 0 and controller.waiting == 0
+
+    asyncio.run(scenario())
+
+
+def test_admission_wait_timeout():
+    async def scenario():
+        controller = AdmissionController(concurrency=1, max_queue=5, max_wait=0.05)
+        async with controller.slot():
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with controller.slot():
+                    pass
+        assert rejected.value.reason == "wait_timeout"
+
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+# tests/test_builds.py
+
+import json
+from types import SimpleNamespace
+
+from services import cache, openai_generator
+
+
+def fake_completion(calls):
+    answers = {
+        "skill_build": {"skill_build": ["Q", "W", "E"], "talents": {"10": "+20 урона"}},
+        "Противники на линии": {"early_game": "Стой за крипами.", "warnings": ["Опасная линия."]},
+        "Союзники": {"game_plan": {"early_game": "-", "mid_game": "Ганкай.", "late_game": "Дерись."}, "warnings": []},
+        "starting_items": {
+            "starting_items": ["tango"], "early_game_items": ["boots"], "mid_game_items": ["kaya"],
+            "late_game_items": ["refresher"], "situational_items": ["lotus_orb"],
+            "item_explanations": {"kaya": "Усиление заклинаний."},
+        },
+    }
+
+    def completion(system_msg, user_msg, **kwargs):
+        calls.append(user_msg)
+        for marker, answer in answers.items():
+            if marker in user_msg:
+                return SimpleNamespace(content=json.dumps(answer, ensure_ascii=False))
+        return None
+
+    return completion
+
+
+def test_sectioned_build_merges_and_caches_sections(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    calls = []
+    monkeypatch.setattr(openai_generator, "chat_completion", fake_completion(calls))
+
+    build = openai_generator.generate_detailed_build_sectioned(
+        "lina", "mid", "magic", "magic_burst", ["axe"], ["crystal_maiden"]
+    )
+
+    assert build.source == "openai"
+    assert build.starting_items == ["tango"]
+    assert build.skill_build == ["Q", "W", "E"]
+    assert build.game_plan["early_game"] == "Стой за крипами."
+    assert build.game_plan["mid_game"] == "Ганкай."
+    assert build.warnings == ["Опасная линия."]
+    assert len(calls) == 4
+
+    # Другой драфт: предметы и навыки берутся из кэша, генерируются только линия и стратегия
+    openai_generator.generate_detailed_build_sectioned(
+        "lina", "mid", "magic", "magic_burst", ["zeus"], ["crystal_maiden"]
+    )
+    assert len(calls) == 6
@@ -0,0 +1,88 @@
+# tests/test_meta.py
+
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+from main import app
+from services.meta_loader import stamp_generation
+
+client = TestClient(app)
+
+
+def test_meta_etag_and_not_modified():
+    response = client.get("/meta")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "heroes" in response.json()
+
+    cached = client.get("/meta", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_meta_projection_and_role_filter():
+    response = client.get("/meta?fields=winrate,roles&role=carry")
+    assert response.status_code == 200
+    heroes = response.json()["heroes"]
+    assert heroes
+    for info in heroes.values():
+        assert set(info) == {"winrate", "roles"}
+        assert "carry" in [r.lower() for r in info["roles"]]
+
+    assert client.get("/meta?fields=unknown").status_code == 400
+
+
+def test_meta_gzip():
+    response = client.get("/meta", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    # TestClient сам распаковывает gzip
+    assert "heroes" in response.json()
+
+
+def test_meta_delta():
+    generation = client.get("/meta").json()["generation"]
+    response = client.get(f"/meta/delta?since={generation}")
+    assert response.status_code == 200
+    assert response.json()["heroes"] == {}
+    assert client.get(f"/meta/delta?since={generation + 1}").status_code == 400
+
+
+def test_stamp_generation_marks_changed_heroes():
+    previous = {"axe": {"winrate": 0.5}, "lina": {"winrate": 0.5}, "_generation": 3,
+                "_hero_generations": {"axe": 2, "lina": 3}}
+    meta = {"axe": {"winrate": 0.5}, "lina": {"winrate": 0.55}}
+
+    changed = stamp_generation(meta, previous)
+
+    assert changed == ["lina"]
+    assert meta["_generation"] == 4
+    assert meta["_hero_generations"] == {"axe": 2, "lina": 4}
+
+
+def test_meta_history_trending(tmp_path, monkeypatch):
+    from services import meta_history
+
+    monkeypatch.setattr(meta_history, "HISTORY_DIR", tmp_path)
+    monkeypatch.setattr(meta_history, "COLUMNS_PATH", tmp_path / "columns.json")
+    monkeypatch.setattr(meta_history, "TIMESTAMPS_PATH", tmp_path / "timestamps.f8")
+    monkeypatch.setattr(meta_history, "GENERATIONS_PATH", tmp_path / "generations.i4")
+    monkeypatch.setattr(meta_history, "_history", None)
+
+    for generation, (axe, lina) in enumerate([(0.50, 0.50), (0.50, 0.53), (0.49, 0.56)], start=1):
+        meta = {
+            "axe": {"winrate": axe, "pick_rate": 0.1, "ban_rate": 0.1},
+            "lina": {"winrate": lina, "pick_rate": 0.1, "ban_rate": 0.1},
+            "_generation": generation,
+        }
+        assert meta_history.append_snapshot(meta)
+    assert not meta_history.append_snapshot(meta)  # то же поколение не дублируется
+
+    history = meta_history.open_history()
+    assert len(history) == 3
+    assert history.metrics["winrate"].shape == (3, meta_history.CAPACITY)
+
+    trending = meta_history.trending_heroes(window=2, limit=2)
+    assert [t["hero"] for t in trending] == ["lina", "axe"]
+    assert trending[0]["delta"] == 0.06
+    assert trending[0]["rank_change"] == 1
@@ -0,0 +1,47 @@
+# tests/test_model_router.py
+
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from scripts.fake_openai import create_app
+from services import openai_generator
+from services.model_router import ModelPolicy, ModelRouter
+
+
+def test_router_switches_to_fast_model_when_primary_breaks_slo(monkeypatch):
+    # Локальная заглушка: основная модель отвечает медленно, быстрая — сразу
+    fake = create_app(latency=0.0, jitter=0.0, error_rate=0.0, model_latency={"slow-model": 0.15})
+    client = OpenAI(api_key="sk-test", base_url="http://fake/v1", http_client=TestClient(fake), max_retries=0)
+    monkeypatch.setattr(openai_generator, "get_openai_client", lambda: client)
+
+    router = ModelRouter(
+        policies={"recommend": ModelPolicy(primary="slow-model", fallbacks=("fast-model",), latency_slo=0.1)},
+        min_samples=3,
+    )
+    monkeypatch.setattr(openai_generator, "model_router", router)
+
+    used = []
+    for _ in range(6):
+        used.append(router.choose("recommend"))
+        openai_generator.chat_completion("system", "suggested_heroes", task="recommend")
+
+    assert used[:3] == ["slow-model"] * 3
+    assert "fast-model" in used[3:]
+    assert router.stats("slow-model").p95_latency > 0.1
+    assert router.stats("fast-model").p95_latency < 0.1
+
+
+def test_router_returns_to_primary_after_window_expires():
+    now = [0.0]
+    router = ModelRouter(
+        policies={"recommend": ModelPolicy(primary="slow-model", fallbacks=("fast-model",), latency_slo=1.0)},
+        window_seconds=60,
+        min_samples=2,
+        clock=lambda: now[0],
+    )
+    router.record("slow-model", 5.0, ok=True)
+    router.record("slow-model", 5.0, ok=True)
+    assert router.choose("recommend") == "fast-model"
+
+    now[0] = 120.0
+    assert router.choose("recommend") == "slow-model"
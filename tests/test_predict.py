@@ -0,0 +1,70 @@
+# tests/test_predict.py
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from main import app
+from services.draft_model import score_drafts, team_matrix
+from services.hero_data import HeroMatrices
+
+client = TestClient(app)
+
+
+def test_predict_draft():
+    response = client.post("/predict/draft", json={
+        "ally_heroes": ["earth_spirit", "broodmother"],
+        "enemy_heroes": ["axe"],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    low, high = data["confidence_interval"]
+    assert low <= data["win_probability"] <= high
+    assert 0 < data["win_probability"] < 1
+
+
+def test_predict_draft_rejects_unknown_and_duplicate_heroes():
+    assert client.post("/predict/draft", json={"ally_heroes": ["not_a_hero"]}).status_code == 400
+    assert client.post("/predict/draft", json={"ally_heroes": ["axe"], "enemy_heroes": ["axe"]}).status_code == 400
+
+
+def test_predict_batch_matches_single():
+    drafts = [
+        {"ally_heroes": ["lina", "axe"], "enemy_heroes": ["zeus"]},
+        {"ally_heroes": ["zeus"], "enemy_heroes": ["lina", "axe"]},
+    ]
+    batch = client.post("/predict/draft/batch", json={"drafts": drafts}).json()
+    single = client.post("/predict/draft", json=drafts[0]).json()
+    assert batch["win_probabilities"][0] == single["win_probability"]
+    # Зеркальный драфт даёт дополнительную вероятность
+    assert abs(sum(batch["win_probabilities"]) - 1) < 1e-3
+
+
+def test_score_drafts_uses_matchup_and_synergy():
+    size = 3
+    matchup = np.zeros((size, size), dtype=np.float32)
+    matchup[0, 2], matchup[2, 0] = 1.0, -1.0
+    synergy = np.zeros((size, size), dtype=np.float32)
+    synergy[0, 1] = synergy[1, 0] = 0.5
+    m = HeroMatrices(("a", "b", "c"), np.zeros(size, dtype=np.float32), matchup, synergy, generation=0)
+
+    score = score_drafts(team_matrix([[0, 1]], size), team_matrix([[2]], size), m)
+    assert score.matchup[0] == 1.0
+    assert score.synergy[0] == 0.5
+    assert score.probability[0] > 0.5
+
+
+def test_ban_recommendations_skip_taken_and_banned_heroes():
+    response = client.post("/predict/bans?top_k=5", json={
+        "user_role": "mid",
+        "ally_heroes": ["lina", "axe"],
+        "enemy_heroes": ["zeus"],
+        "banned_heroes": ["earth_spirit"],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    bans = [b["hero"] for b in data["bans"]]
+    assert len(bans) == 5
+    assert not {"lina", "axe", "zeus", "zuus", "earth_spirit"} & set(bans)
+    threats = [b["threat"] for b in data["bans"]]
+    assert threats == sorted(threats, reverse=True)
+    assert all(b["best_response"] for b in data["bans"])